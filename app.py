@@ -1,11 +1,18 @@
-import locale
 from datetime import datetime
 from typing import Literal
 
 import streamlit as st
 from streamlit.components.v1 import html
 
-from salary_calculation import calculate_salary, get_payday_schedule, get_usd_rate, get_work_calendar
+from salary_calculation import (
+    PaydayScheduleItem,
+    SalaryResult,
+    calculate_annual_salary,
+    calculate_salary,
+    get_payday_schedule,
+    get_usd_rate,
+    get_work_calendar,
+)
 
 # Constants
 YEARS = [2023, 2024, 2025]
@@ -24,14 +31,31 @@ MONTH_NAMES = [
     "Декабрь",
 ]
 
-# Set Russian locale for number formatting
-locale.setlocale(locale.LC_ALL, "ru_RU.UTF-8")
+
+# Prebuilt currency templates, bound once instead of formatting f-strings on every call
+_format_currency = "<span class='copyable-number' data-copy='{0:.2f}'>{0:,.2f} {1}</span>".format
+_format_usd = "<span class='copyable-number' style='color: gray' data-copy='{0:.2f}'>{0:,.2f} $</span>".format
 
 
 def format_currency(amount: float, currency: str = "₽") -> str:
     if currency == "$":
-        return f"<span class='copyable-number' style='color: gray' data-copy='{amount:.2f}'>{amount:,.2f} {currency}</span>"
-    return f"<span class='copyable-number' data-copy='{amount:.2f}'>{amount:,.2f} {currency}</span>"
+        return _format_usd(amount)
+    return _format_currency(amount, currency)
+
+
+def format_salary_result(result: SalaryResult, usd_rate: float, reverse: bool = False) -> str:
+    rows = [
+        ("Сумма до вычета НДФЛ:", result["before_tax"]),
+        ("Сумма НДФЛ, 13%:", result["tax"]),
+        ("Сумма на руки:", result["after_tax"]),
+    ]
+    if reverse:
+        rows.reverse()
+    body = "<br>\n<br>\n".join(
+        f"<b>{label}</b><br>\n{format_currency(amount)} {format_currency(amount / usd_rate, '$')}"
+        for label, amount in rows
+    )
+    return f"<div style='line-height: 1.1;'>\n{body}\n</div>"
 
 
 def format_number_in_words(amount: float) -> str:
@@ -46,6 +70,90 @@ def get_nearest_year_index(years: list[int]) -> int:
     return min(range(len(years)), key=lambda i: abs(years[i] - current_year))
 
 
+@st.fragment
+def render_month_payments(
+    advance: PaydayScheduleItem,
+    salary: PaydayScheduleItem,
+    year: int,
+    total_working_days: int,
+    amount: float,
+    mode: Literal["До вычета НДФЛ", "На руки"],
+    is_current_month: bool,
+) -> None:
+    # Rendered as a fragment so that editing one month's working days reruns only this month
+    month_num = advance["date"].month
+    month_name = MONTH_NAMES[month_num - 1]
+
+    if is_current_month:
+        st.write(
+            f"**{month_name} {advance['date'].year}**, всего рабочих дней: {total_working_days} <span class='current-month'></span>",
+            unsafe_allow_html=True,
+        )
+    else:
+        st.write(f"**{month_name} {advance['date'].year}**, всего рабочих дней: {total_working_days}")
+
+    # Add working days input fields
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("**Аванс**")
+        col1a, col1b = st.columns([1, 3], vertical_alignment="center")
+        with col1a:
+            advance_working_days = st.number_input(
+                "Рабочих дней",
+                min_value=0,
+                max_value=advance["max_working_days"],
+                value=advance["working_days"],
+                key=f"advance_days_{month_num}",
+                label_visibility="collapsed",
+            )
+        with col1b:
+            st.write(f"из {advance['max_working_days']} рабочих дней")
+        # Recalculate advance salary only if working days differ from the schedule
+        if advance_working_days == advance["working_days"]:
+            advance_salary = advance["salary"]
+        else:
+            advance_salary = calculate_salary(month_num, year, advance_working_days, amount, mode)
+        st.markdown(
+            f"""<div style='line-height: 1.1;'>
+<b>Дата:</b> {advance['date'].strftime('%d.%m.%Y')}<br>
+<b>До вычета НДФЛ:</b> {format_currency(advance_salary['before_tax'])}<br>
+<b>НДФЛ:</b> {format_currency(advance_salary['tax'])}<br>
+<b>На руки:</b> {format_currency(advance_salary['after_tax'])}
+</div>""",
+            unsafe_allow_html=True,
+        )
+
+    with col2:
+        st.write("**Зарплата**")
+        col2a, col2b = st.columns([1, 3], vertical_alignment="center")
+        with col2a:
+            salary_working_days = st.number_input(
+                "Рабочих дней",
+                min_value=0,
+                max_value=salary["max_working_days"],
+                value=salary["working_days"],
+                key=f"salary_days_{month_num}",
+                label_visibility="collapsed",
+            )
+        with col2b:
+            st.write(f"из {salary['max_working_days']} рабочих дней")
+        # Recalculate salary only if working days differ from the schedule
+        if salary_working_days == salary["working_days"]:
+            salary_salary = salary["salary"]
+        else:
+            salary_salary = calculate_salary(month_num, year, salary_working_days, amount, mode)
+        st.markdown(
+            f"""<div style='line-height: 1.1;'>
+<b>Дата:</b> {salary['date'].strftime('%d.%m.%Y')}<br>
+<b>До вычета НДФЛ:</b> {format_currency(salary_salary['before_tax'])}<br>
+<b>НДФЛ:</b> {format_currency(salary_salary['tax'])}<br>
+<b>На руки:</b> {format_currency(salary_salary['after_tax'])}
+</div>""",
+            unsafe_allow_html=True,
+        )
+
+
 st.set_page_config(page_title="Калькулятор зарплаты", layout="wide", page_icon=":dollar:")
 st.sidebar.title("Навигация")
 
@@ -108,62 +216,19 @@ if page == "Посчитать зарплату":
     st.markdown(f"**Курс доллара:** {format_currency(usd_rate)}", unsafe_allow_html=True)
 
     # Calculate annual salary
-    annual_result = {"before_tax": 0.0, "tax": 0.0, "after_tax": 0.0}
-    for month in range(1, 13):
-        month_result = calculate_salary(month, int(year), calendar[month]["workingDays"], amount, mode_literal)
-        annual_result["before_tax"] += month_result["before_tax"]
-        annual_result["tax"] += month_result["tax"]
-        annual_result["after_tax"] += month_result["after_tax"]
+    annual_result = calculate_annual_salary(amount, mode_literal)
 
     # Display results
     st.markdown("---")
     st.subheader("Месячная зарплата")
 
-    if mode == "До вычета НДФЛ":
-        st.markdown(
-            f"""<div style='line-height: 1.1;'>
-<b>Сумма на руки:</b><br>
-{format_currency(result['after_tax'])} {format_currency(result['after_tax'] / usd_rate, '$')}<br>
-<br>
-<b>Сумма НДФЛ, 13%:</b><br>
-{format_currency(result['tax'])} {format_currency(result['tax'] / usd_rate, '$')}<br>
-<br>
-<b>Сумма до вычета НДФЛ:</b><br>
-{format_currency(result['before_tax'])} {format_currency(result['before_tax'] / usd_rate, '$')}
-</div>""",
-            unsafe_allow_html=True,
-        )
-    else:
-        st.markdown(
-            f"""<div style='line-height: 1.1;'>
-<b>Сумма до вычета НДФЛ:</b><br>
-{format_currency(result['before_tax'])} {format_currency(result['before_tax'] / usd_rate, '$')}<br>
-<br>
-<b>Сумма НДФЛ, 13%:</b><br>
-{format_currency(result['tax'])} {format_currency(result['tax'] / usd_rate, '$')}<br>
-<br>
-<b>Сумма на руки:</b><br>
-{format_currency(result['after_tax'])} {format_currency(result['after_tax'] / usd_rate, '$')}
-</div>""",
-            unsafe_allow_html=True,
-        )
+    # Show the calculated amount first: after tax for a salary before tax and vice versa
+    st.markdown(format_salary_result(result, usd_rate, reverse=mode == "До вычета НДФЛ"), unsafe_allow_html=True)
 
     # Display annual salary
     st.markdown("---")
     st.subheader("Годовая зарплата")
-    st.markdown(
-        f"""<div style='line-height: 1.1;'>
-<b>Сумма до вычета НДФЛ:</b><br>
-{format_currency(annual_result['before_tax'])} {format_currency(annual_result['before_tax'] / usd_rate, '$')}<br>
-<br>
-<b>Сумма НДФЛ, 13%:</b><br>
-{format_currency(annual_result['tax'])} {format_currency(annual_result['tax'] / usd_rate, '$')}<br>
-<br>
-<b>Сумма на руки:</b><br>
-{format_currency(annual_result['after_tax'])} {format_currency(annual_result['after_tax'] / usd_rate, '$')}
-</div>""",
-        unsafe_allow_html=True,
-    )
+    st.markdown(format_salary_result(annual_result, usd_rate), unsafe_allow_html=True)
 
 
 elif page == "Спланировать выплаты":
@@ -200,93 +265,25 @@ elif page == "Спланировать выплаты":
     st.markdown("---")
     st.subheader("График выплат")
 
-    # Collect working days from all months
-    working_days_list = []
+    calendar = get_work_calendar(int(year))
+
     for i in range(0, len(schedule), 2):
         if i + 1 < len(schedule):  # Ensure we have both advance and salary
             advance = schedule[i]
             salary = schedule[i + 1]
-            month_name = MONTH_NAMES[advance["date"].month - 1]
             # Get total working days for the month
             month_num = advance["date"].month
-            calendar = get_work_calendar(int(year))
             total_working_days = calendar[month_num]["workingDays"]
 
             # Check if this is the current month
             is_current_month = month_num == current_date.month and int(year) == current_date.year
 
-            if is_current_month:
-                st.write(
-                    f"**{month_name} {advance['date'].year}**, всего рабочих дней: {total_working_days} <span class='current-month'></span>",
-                    unsafe_allow_html=True,
-                )
-            else:
-                st.write(f"**{month_name} {advance['date'].year}**, всего рабочих дней: {total_working_days}")
-
-            # Add working days input fields
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.write("**Аванс**")
-                col1a, col1b = st.columns([1, 3], vertical_alignment="center")
-                with col1a:
-                    advance_working_days = st.number_input(
-                        "Рабочих дней",
-                        min_value=0,
-                        max_value=advance["max_working_days"],
-                        value=advance["working_days"],
-                        key=f"advance_days_{month_num}",
-                        label_visibility="collapsed",
-                    )
-                with col1b:
-                    st.write(f"из {advance['max_working_days']} рабочих дней")
-                # Recalculate advance salary
-                advance_salary = calculate_salary(month_num, int(year), advance_working_days, amount, mode_literal)
-                st.markdown(
-                    f"""<div style='line-height: 1.1;'>
-<b>Дата:</b> {advance['date'].strftime('%d.%m.%Y')}<br>
-<b>До вычета НДФЛ:</b> {format_currency(advance_salary['before_tax'])}<br>
-<b>НДФЛ:</b> {format_currency(advance_salary['tax'])}<br>
-<b>На руки:</b> {format_currency(advance_salary['after_tax'])}
-</div>""",
-                    unsafe_allow_html=True,
-                )
-
-            with col2:
-                st.write("**Зарплата**")
-                col2a, col2b = st.columns([1, 3], vertical_alignment="center")
-                with col2a:
-                    salary_working_days = st.number_input(
-                        "Рабочих дней",
-                        min_value=0,
-                        max_value=salary["max_working_days"],
-                        value=salary["working_days"],
-                        key=f"salary_days_{month_num}",
-                        label_visibility="collapsed",
-                    )
-                with col2b:
-                    st.write(f"из {salary['max_working_days']} рабочих дней")
-                # Recalculate salary
-                salary_salary = calculate_salary(month_num, int(year), salary_working_days, amount, mode_literal)
-                st.markdown(
-                    f"""<div style='line-height: 1.1;'>
-<b>Дата:</b> {salary['date'].strftime('%d.%m.%Y')}<br>
-<b>До вычета НДФЛ:</b> {format_currency(salary_salary['before_tax'])}<br>
-<b>НДФЛ:</b> {format_currency(salary_salary['tax'])}<br>
-<b>На руки:</b> {format_currency(salary_salary['after_tax'])}
-</div>""",
-                    unsafe_allow_html=True,
-                )
-
-            # Add to working days list
-            working_days_list.append((advance_working_days, salary_working_days))
+            render_month_payments(
+                advance, salary, int(year), total_working_days, amount, mode_literal, is_current_month
+            )
 
             st.markdown("---")
 
-    # Recalculate schedule with custom working days
-    if working_days_list:
-        schedule = get_payday_schedule(int(year), advance_day, mode_literal, amount, working_days=working_days_list)
-
 else:  # Производственный календарь
     st.title("Производственный календарь")
 
@@ -340,20 +337,25 @@ notification.style.cssText = `
 
 doc.body.appendChild(notification);
 
-const copyable_numbers = doc.querySelectorAll('.copyable-number');
-
-copyable_numbers.forEach(number => {
-    number.addEventListener('click', () => {
-        navigator.clipboard.writeText(number.dataset.copy).then(() => {
-            notification.textContent = 'Скопировано в буфер обмена';
-            notification.style.opacity = '1';
-            
-            setTimeout(() => {
-                notification.style.opacity = '0';
-            }, 2000);
-        });
+// Listen on the whole document so numbers re-rendered by fragment reruns stay copyable
+if (doc.copyableNumbersListener) {
+    doc.removeEventListener('click', doc.copyableNumbersListener);
+}
+doc.copyableNumbersListener = event => {
+    const number = event.target.closest('.copyable-number');
+    if (!number) {
+        return;
+    }
+    navigator.clipboard.writeText(number.dataset.copy).then(() => {
+        notification.textContent = 'Скопировано в буфер обмена';
+        notification.style.opacity = '1';
+
+        setTimeout(() => {
+            notification.style.opacity = '0';
+        }, 2000);
     });
-});
+};
+doc.addEventListener('click', doc.copyableNumbersListener);
 </script>
 """,
     height=0,
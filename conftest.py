@@ -3,7 +3,30 @@ from functools import lru_cache
 import pytest
 
 
-@pytest.fixture(autouse=True)
-def patch_streamlit_cache(monkeypatch):
-    """Patch streamlit.cache_data decorator with lru_cache for testing."""
-    monkeypatch.setattr("streamlit.cache_data", lru_cache())
+def cache_data(func=None, **kwargs):
+    """Stand-in for st.cache_data backed by lru_cache, ignoring Streamlit-specific options."""
+    if func is None:
+        return lru_cache()
+    return lru_cache()(func)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolate_http_cache(tmp_path_factory):
+    """Keep the HTTP response cache out of the repository during tests.
+
+    Session scoped so the location is set before any session fixture imports salary_calculation.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("PAYDAY_HTTP_CACHE_PATH", str(tmp_path_factory.mktemp("http_cache") / ".http_cache"))
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def patch_streamlit_cache():
+    """Patch streamlit.cache_data decorator with lru_cache for testing.
+
+    Session scoped so the patch is active before any session fixture imports salary_calculation.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("streamlit.cache_data", cache_data)
+        yield
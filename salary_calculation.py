@@ -1,8 +1,23 @@
+import os
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
+from pathlib import Path
 from typing import Literal, TypedDict, assert_never
 
-import requests
+import numpy as np
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from requests_cache import NEVER_EXPIRE, CachedSession
+from urllib3.util.retry import Retry
+
+TAX_RATE = 0.13
+# Cache key includes the free-form salary amount, so keep the number of cached results bounded
+CALCULATE_SALARY_CACHE_ENTRIES = 1024
+REQUEST_TIMEOUT = (3, 5)  # (connect, read) seconds
+# Responses are persisted on disk so they survive process restarts, override the location with PAYDAY_HTTP_CACHE_PATH
+HTTP_CACHE_PATH = Path(os.environ.get("PAYDAY_HTTP_CACHE_PATH", Path(__file__).parent / ".http_cache"))
+HTTP_CACHE_EXPIRE_AFTER = timedelta(days=1)
 
 
 class Month(TypedDict):
@@ -40,6 +55,37 @@ class PaydayScheduleItem(TypedDict):
     date_was_moved: bool
 
 
+@st.cache_resource
+def _http() -> CachedSession:
+    """Get the HTTP session shared by all API requests.
+
+    Returns:
+        A session reusing pooled connections to the calendar and exchange rate APIs
+        and caching their responses on disk
+    """
+    session = CachedSession(HTTP_CACHE_PATH, expire_after=HTTP_CACHE_EXPIRE_AFTER, allowable_methods=["GET"])
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def _calendar_expire_after(year: int) -> int | timedelta:
+    """Get how long to keep cached calendar responses for a given year.
+
+    Args:
+        year: The year the calendar data is requested for
+
+    Returns:
+        NEVER_EXPIRE for past years, whose calendars never change,
+        otherwise the default expiration
+    """
+    return NEVER_EXPIRE if year < date.today().year else HTTP_CACHE_EXPIRE_AFTER
+
+
 @st.cache_data
 def get_work_calendar(year: int) -> dict[int, Month]:
     """Get work calendar for a given year.
@@ -56,7 +102,66 @@ def get_work_calendar(year: int) -> dict[int, Month]:
         - shortDays: Number of short days
         - workingHours: Total working hours
     """
-    response = requests.get(f"https://calendar.kuzyak.in/api/calendar/{year}")
+    return _fetch_work_calendar(_http(), year)
+
+
+@st.cache_data
+def get_holidays_and_short_days(year: int) -> HolidaysData:
+    """Get holidays and short days for a given year.
+
+    Args:
+        year: The year to get the data for
+
+    Returns:
+        A dictionary containing:
+        - year: The year
+        - holidays: List of holidays with dates and names
+        - shortDays: List of short days with dates and names
+    """
+    return _fetch_holidays_and_short_days(_http(), year)
+
+
+def get_holiday_dates(year: int) -> frozenset[date]:
+    """Get the set of holiday dates for a given year.
+
+    Args:
+        year: The year to get the holiday dates for
+
+    Returns:
+        A frozenset of holiday dates for constant-time membership checks
+    """
+    return _fetch_year(year)[1]
+
+
+@st.cache_data
+def _fetch_year(year: int) -> tuple[dict[int, Month], frozenset[date]]:
+    """Fetch work calendar and holiday dates for a given year concurrently.
+
+    Both are independent network requests, so they are made from two worker threads.
+    The workers only use the HTTP session and never touch Streamlit.
+
+    Args:
+        year: The year to fetch the data for
+
+    Returns:
+        A tuple of the work calendar (see get_work_calendar) and the set of holiday dates
+    """
+    session = _http()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        calendar_future = executor.submit(_fetch_work_calendar, session, year)
+        holidays_future = executor.submit(_fetch_holidays_and_short_days, session, year)
+        calendar, holidays_data = calendar_future.result(), holidays_future.result()
+
+    return calendar, frozenset(h["date"] for h in holidays_data["holidays"])
+
+
+def _fetch_work_calendar(session: CachedSession, year: int) -> dict[int, Month]:
+    """Fetch work calendar for a given year, see get_work_calendar."""
+    response = session.get(
+        f"https://calendar.kuzyak.in/api/calendar/{year}",
+        timeout=REQUEST_TIMEOUT,
+        expire_after=_calendar_expire_after(year),
+    )
     response.raise_for_status()
     calendar_data = response.json()
 
@@ -75,20 +180,13 @@ def get_work_calendar(year: int) -> dict[int, Month]:
     return months_data
 
 
-@st.cache_data
-def get_holidays_and_short_days(year: int) -> HolidaysData:
-    """Get holidays and short days for a given year.
-
-    Args:
-        year: The year to get the data for
-
-    Returns:
-        A dictionary containing:
-        - year: The year
-        - holidays: List of holidays with dates and names
-        - shortDays: List of short days with dates and names
-    """
-    response = requests.get(f"https://calendar.kuzyak.in/api/calendar/{year}/holidays")
+def _fetch_holidays_and_short_days(session: CachedSession, year: int) -> HolidaysData:
+    """Fetch holidays and short days for a given year, see get_holidays_and_short_days."""
+    response = session.get(
+        f"https://calendar.kuzyak.in/api/calendar/{year}/holidays",
+        timeout=REQUEST_TIMEOUT,
+        expire_after=_calendar_expire_after(year),
+    )
     response.raise_for_status()
     raw_data = response.json()
 
@@ -108,6 +206,39 @@ def get_holidays_and_short_days(year: int) -> HolidaysData:
     return HolidaysData(**holidays_data)
 
 
+@st.cache_data
+def get_working_days_mask(year: int) -> np.ndarray:
+    """Get working day flags for every day of a given year.
+
+    Args:
+        year: The year to get the flags for
+
+    Returns:
+        A boolean array indexed by day of the year (0 is January 1st),
+        True for days that are neither weekends nor holidays
+    """
+    holiday_dates = get_holiday_dates(year)
+    days = np.arange(f"{year}-01-01", f"{year + 1}-01-01", dtype="datetime64[D]")
+    return np.is_busday(days, weekmask="1111100", holidays=np.array(sorted(holiday_dates), dtype="datetime64[D]"))
+
+
+@st.cache_data
+def get_previous_working_days(year: int) -> np.ndarray:
+    """Get the nearest working day on or before every day of a given year.
+
+    Args:
+        year: The year to build the table for
+
+    Returns:
+        An integer array indexed by day of the year (0 is January 1st) holding
+        the day of the year of the previous working day, or -1 if it falls in the previous year
+    """
+    working_days_mask = get_working_days_mask(year)
+    day_indexes = np.arange(len(working_days_mask))
+    return np.maximum.accumulate(np.where(working_days_mask, day_indexes, -1))
+
+
+@st.cache_data(max_entries=CALCULATE_SALARY_CACHE_ENTRIES, show_spinner=False)
 def calculate_salary(
     month: int,
     year: int,
@@ -130,13 +261,44 @@ def calculate_salary(
         - tax: Tax amount (NDFL)
         - after_tax: Amount after tax
     """
-    TAX_RATE = 0.13
-
     calendar = get_work_calendar(year)
     work_days = calendar[month]["workingDays"]
     daily_rate = amount / work_days
     period_amount = daily_rate * days_worked
 
+    return _apply_tax(period_amount, mode)
+
+
+def calculate_annual_salary(
+    amount: float,
+    mode: Literal["До вычета НДФЛ", "На руки"] = "До вычета НДФЛ",
+) -> SalaryResult:
+    """Calculate salary for a fully worked year.
+
+    Args:
+        amount: Monthly amount specified (either before or after tax)
+        mode: Either "До вычета НДФЛ" or "На руки"
+
+    Returns:
+        Dictionary containing the yearly totals:
+        - before_tax: Amount before tax
+        - tax: Tax amount (NDFL)
+        - after_tax: Amount after tax
+    """
+    # Every month is worked in full, so each month pays exactly the specified amount
+    return _apply_tax(12 * amount, mode)
+
+
+def _apply_tax(period_amount: float, mode: Literal["До вычета НДФЛ", "На руки"]) -> SalaryResult:
+    """Split a period amount into before tax, tax and after tax parts.
+
+    Args:
+        period_amount: Amount for the period (either before or after tax)
+        mode: Either "До вычета НДФЛ" or "На руки"
+
+    Returns:
+        Dictionary containing before_tax, tax and after_tax amounts
+    """
     if mode == "До вычета НДФЛ":
         before_tax = period_amount
         tax = before_tax * TAX_RATE
@@ -153,27 +315,42 @@ def calculate_salary(
     return {"before_tax": before_tax, "tax": tax, "after_tax": after_tax}
 
 
-def get_previous_working_day(date: date, holidays_data: HolidaysData) -> date:
+def get_previous_working_day(date: date, holiday_dates: frozenset[date]) -> date:
     """Find the previous working day that is not a holiday or weekend.
 
     Args:
         date: The date to start checking from
-        holidays_data: Holidays and short days data
+        holiday_dates: Set of holiday dates
 
     Returns:
         The previous working day
     """
     current_date = date
-    while True:
-        # Check if it's a holiday
-        is_holiday = any(h["date"] == current_date for h in holidays_data["holidays"])
-        # Check if it's a weekend (5=Saturday, 6=Sunday)
-        is_weekend = current_date.weekday() >= 5
+    # Skip holidays and weekends (5=Saturday, 6=Sunday)
+    while current_date in holiday_dates or current_date.weekday() >= 5:
+        current_date -= timedelta(days=1)
+    return current_date
 
-        if not is_holiday and not is_weekend:
-            return current_date
 
-        current_date -= timedelta(days=1)
+def _lookup_previous_working_day(
+    day: date, year: int, previous_working_days: np.ndarray, holiday_dates: frozenset[date]
+) -> date:
+    """Find the previous working day using the precomputed table when the day is covered by it.
+
+    Args:
+        day: The date to start checking from
+        year: The year the table was built for
+        previous_working_days: Table from get_previous_working_days for the year
+        holiday_dates: Set of holiday dates, used for days outside the table
+
+    Returns:
+        The previous working day
+    """
+    if day.year == year:
+        previous_index = int(previous_working_days[day.timetuple().tm_yday - 1])
+        if previous_index >= 0:
+            return date(year, 1, 1) + timedelta(days=previous_index)
+    return get_previous_working_day(day, holiday_dates)
 
 
 def get_payday_schedule(
@@ -203,8 +380,9 @@ def get_payday_schedule(
         - salary: Salary calculation result
     """
     schedule: list[PaydayScheduleItem] = []
-    calendar = get_work_calendar(year)
-    holidays_data = get_holidays_and_short_days(year)
+    calendar, holiday_dates = _fetch_year(year)
+    working_days_mask = get_working_days_mask(year)
+    previous_working_days = get_previous_working_days(year)
 
     if working_days is not None and len(working_days) != 12:
         raise ValueError("working_days must contain exactly 12 tuples (one for each month)")
@@ -212,10 +390,10 @@ def get_payday_schedule(
     for month in range(1, 13):
         # Calculate advance payment date
         # Handle months with fewer days than advance_day
-        last_day_of_month = (date(year, month + 1, 1) - timedelta(days=1)).day if month < 12 else 31
+        last_day_of_month = monthrange(year, month)[1]
         actual_advance_day = min(advance_day, last_day_of_month)
         original_advance_date = date(year, month, actual_advance_day)
-        advance_date = get_previous_working_day(original_advance_date, holidays_data)
+        advance_date = _lookup_previous_working_day(original_advance_date, year, previous_working_days, holiday_dates)
         advance_date_was_moved = advance_date != original_advance_date
 
         # Calculate salary payment date (next month)
@@ -229,29 +407,15 @@ def get_payday_schedule(
             salary_year = year + 1
 
         # Handle months with fewer days than salary_day
-        last_day_of_salary_month = (
-            (date(salary_year, salary_month + 1, 1) - timedelta(days=1)).day if salary_month < 12 else 31
-        )
+        last_day_of_salary_month = monthrange(salary_year, salary_month)[1]
         actual_salary_day = min(salary_day, last_day_of_salary_month)
         original_salary_date = date(salary_year, salary_month, actual_salary_day)
-        salary_date = get_previous_working_day(original_salary_date, holidays_data)
+        salary_date = _lookup_previous_working_day(original_salary_date, year, previous_working_days, holiday_dates)
         salary_date_was_moved = salary_date != original_salary_date
 
         # Count working days in first half of month
-        first_day = date(year, month, 1)
-        last_day = date(year, month, 15)
-        current_day = first_day
-        max_advance_working_days = 0
-
-        while current_day <= last_day:
-            # Check if it's a holiday or weekend
-            is_holiday = any(h["date"] == current_day for h in holidays_data["holidays"])
-            is_weekend = current_day.weekday() >= 5  # 5 is Saturday, 6 is Sunday
-
-            if not is_holiday and not is_weekend:
-                max_advance_working_days += 1
-
-            current_day += timedelta(days=1)
+        first_day_index = date(year, month, 1).timetuple().tm_yday - 1
+        max_advance_working_days = int(working_days_mask[first_day_index : first_day_index + 15].sum())
 
         # For salary: remaining working days in month
         max_salary_working_days = calendar[month]["workingDays"] - max_advance_working_days
@@ -306,7 +470,7 @@ def get_usd_rate() -> float:
         Current USD exchange rate in RUB
     """
     try:
-        response = requests.get("https://www.cbr-xml-daily.ru/daily_json.js")
+        response = _http().get("https://www.cbr-xml-daily.ru/daily_json.js", timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         return float(data["Valute"]["USD"]["Value"])
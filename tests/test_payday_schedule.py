@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 
 import pytest
 
@@ -12,14 +12,10 @@ def test_get_payday_schedule_basic():
 
     # Should have 24 items (12 months * 2 payments)
     assert len(schedule) == 24
+    by_date = {(item["date"], item["it_is"]): item for item in schedule}
 
     # Check first month (January)
-    for item in schedule:
-        if item["date"] == date(2025, 1, 24):
-            jan_advance = item
-            break
-    else:
-        assert False, "Advance not found"
+    jan_advance = by_date[(date(2025, 1, 24), "advance")]
 
     assert jan_advance["it_is"] == "advance"
     assert jan_advance["working_days"] == 5  # January has 17 working days, but advance is only for first 5
@@ -27,13 +23,7 @@ def test_get_payday_schedule_basic():
     assert jan_advance["salary"]["tax"] == pytest.approx(2294, abs=1)
     assert jan_advance["salary"]["after_tax"] == pytest.approx(15352, abs=1)
 
-    for item in schedule:
-        if item["date"] == date(2025, 2, 10):
-            jan_salary = item
-            break
-    else:
-        assert False, "Salary not found"
-
+    jan_salary = by_date[(date(2025, 2, 10), "salary")]
     assert jan_salary["it_is"] == "salary"
     assert jan_salary["working_days"] == 12
     assert jan_salary["salary"]["before_tax"] == pytest.approx(42352, abs=1)
@@ -48,20 +38,11 @@ def test_get_payday_schedule_net_mode():
     # Test with January 2025, advance on 25th, 60k salary after tax
     schedule = get_payday_schedule(2025, 25, "На руки", 60000.0)
 
-    # Check first month (January)
-    for item in schedule:
-        if item["date"] == date(2025, 1, 24):  # 24 because 25th is a holiday
-            jan_advance = item
-            break
-    else:
-        assert False, "Advance not found"
+    by_date = {(item["date"], item["it_is"]): item for item in schedule}
 
-    for item in schedule:
-        if item["date"] == date(2025, 2, 10):
-            jan_salary = item
-            break
-    else:
-        assert False, "Salary not found"
+    # Check first month (January)
+    jan_advance = by_date[(date(2025, 1, 24), "advance")]  # 24 because 25th is a holiday
+    jan_salary = by_date[(date(2025, 2, 10), "salary")]
 
     # sum up
     assert jan_advance["salary"]["before_tax"] + jan_salary["salary"]["before_tax"] == pytest.approx(68965, abs=1)
@@ -85,3 +66,25 @@ def test_get_payday_schedule_year_rollover():
 
     assert dec_salary["it_is"] == "salary"
     assert dec_salary["working_days"] == 11  # December has 22 working days, 11 for advance, 11 for salary
+
+
+def test_lookup_previous_working_day_matches_walk_back():
+    """Test that the precomputed previous working day table agrees with walking back day by day."""
+    from salary_calculation import (
+        _lookup_previous_working_day,
+        get_holiday_dates,
+        get_previous_working_day,
+        get_previous_working_days,
+    )
+
+    holiday_dates = get_holiday_dates(2025)
+    previous_working_days = get_previous_working_days(2025)
+
+    # Every day of 2025, starting with the January 1st holiday that has no working day before it in the table,
+    # plus a day of the next year that is not covered by the table at all
+    days = [date(2025, 1, 1) + timedelta(days=offset) for offset in range(365)]
+    days.append(date(2026, 1, 10))
+
+    for day in days:
+        expected = get_previous_working_day(day, holiday_dates)
+        assert _lookup_previous_working_day(day, 2025, previous_working_days, holiday_dates) == expected, day
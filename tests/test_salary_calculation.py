@@ -3,45 +3,49 @@ from datetime import date
 import pytest
 
 
-def test_get_work_calendar():
+@pytest.fixture(scope="session")
+def calendars():
+    """Fetch work calendars once per test session."""
     from salary_calculation import get_work_calendar
 
+    return {year: get_work_calendar(year) for year in (2024, 2025)}
+
+
+@pytest.fixture(scope="session")
+def holidays():
+    """Fetch holidays and short days once per test session."""
+    from salary_calculation import get_holidays_and_short_days
+
+    return {2025: get_holidays_and_short_days(2025)}
+
+
+def test_get_work_calendar(calendars):
     """Test that work calendar is correctly generated for different years."""
     # Test 2025 calendar
-    calendar_2025 = get_work_calendar(2025)
+    calendar_2025 = calendars[2025]
 
     # Basic validation
     assert len(calendar_2025) == 12, "Should have 12 months"
-    assert all(isinstance(data, dict) for data in calendar_2025.values()), "All values should be dictionaries"
-    assert all("workingDays" in data for data in calendar_2025.values()), "All month data should have workingDays"
-
-    # Validation based on official work calendar for 2025
-    assert calendar_2025[1]["workingDays"] == 17, "January 2025 should have 17 work days"
-    assert calendar_2025[2]["workingDays"] == 20, "February 2025 should have 20 work days"
-    assert calendar_2025[3]["workingDays"] == 21, "March 2025 should have 21 work days"
-    assert calendar_2025[4]["workingDays"] == 22, "April 2025 should have 22 work days"
-    assert calendar_2025[5]["workingDays"] == 18, "May 2025 should have 18 work days"
-    assert calendar_2025[6]["workingDays"] == 19, "June 2025 should have 19 work days"
-    assert calendar_2025[7]["workingDays"] == 23, "July 2025 should have 23 work days"
-    assert calendar_2025[8]["workingDays"] == 21, "August 2025 should have 21 work days"
-    assert calendar_2025[9]["workingDays"] == 22, "September 2025 should have 22 work days"
-    assert calendar_2025[10]["workingDays"] == 23, "October 2025 should have 23 work days"
-    assert calendar_2025[11]["workingDays"] == 19, "November 2025 should have 20 work days"
-    assert calendar_2025[12]["workingDays"] == 22, "December 2025 should have 23 work days"
+    assert all(isinstance(data, dict) and "workingDays" in data for data in calendar_2025.values()), (
+        "All month data should be dictionaries with workingDays"
+    )
+
+    # Validation based on official work calendar for 2025, January to December
+    expected_working_days = [17, 20, 21, 22, 18, 19, 23, 21, 22, 23, 19, 22]
+    assert [calendar_2025[month]["workingDays"] for month in range(1, 13)] == expected_working_days
 
     # Test 2024 calendar
-    calendar_2024 = get_work_calendar(2024)
+    calendar_2024 = calendars[2024]
     assert len(calendar_2024) == 12, "2024 calendar should have 12 months"
-    assert all(isinstance(data, dict) for data in calendar_2024.values()), "All values should be dictionaries"
-    assert all("workingDays" in data for data in calendar_2024.values()), "All month data should have workingDays"
+    assert all(isinstance(data, dict) and "workingDays" in data for data in calendar_2024.values()), (
+        "All month data should be dictionaries with workingDays"
+    )
 
 
-def test_get_holidays_and_short_days():
+def test_get_holidays_and_short_days(holidays):
     """Test that holidays and short days are correctly retrieved."""
-    from salary_calculation import get_holidays_and_short_days
-
     # Test 2025 calendar
-    holidays_2025 = get_holidays_and_short_days(2025)
+    holidays_2025 = holidays[2025]
 
     # Basic validation
     assert isinstance(holidays_2025, dict), "Should return a dictionary"
@@ -72,36 +76,52 @@ def test_get_holidays_and_short_days():
         assert ny_date in holiday_dates, f"{ny_date} should be a holiday"
 
 
-def test_calculate_salary():
-    """Test salary calculation for different scenarios."""
-    from salary_calculation import calculate_salary
-
-    test_cases = [
+@pytest.mark.parametrize(
+    "month,year,days_worked,salary_before_tax,expected_salary",
+    [
         # (month, year, days_worked, Оклад до вычета НДФЛ, Выплата на руки)
         (1, 2025, 17, 60000, 52200.00),  # January 2025, full month
         (1, 2025, 15, 60000, 46058.83),  # January 2025, partial month
         (2, 2025, 20, 60000, 52200.00),  # February 2025, full month
         (2, 2025, 15, 60000, 39150.00),  # February 2025, partial month
-    ]
+    ],
+)
+def test_calculate_salary_gross(month, year, days_worked, salary_before_tax, expected_salary):
+    """Test salary calculation for "До вычета НДФЛ" mode."""
+    from salary_calculation import calculate_salary
+
+    result = calculate_salary(month, year, days_worked, salary_before_tax)
+    assert result["after_tax"] == pytest.approx(expected_salary, abs=0.01)
 
-    for month, year, days_worked, salary_before_tax, expected_salary in test_cases:
-        result = calculate_salary(month, year, days_worked, salary_before_tax)
-        assert result["after_tax"] == pytest.approx(
-            expected_salary, abs=0.01
-        ), f"Failed for month {month}, year {year}, days worked {days_worked}"
 
-    # Test cases for "На руки" mode
-    test_cases_net = [
+@pytest.mark.parametrize(
+    "month,year,days_worked,net_salary,expected_salary",
+    [
         # (month, year, days_worked, Оклад на руки, Выплата до вычета НДФЛ)
         (1, 2025, 17, 60000.00, 68965.52),  # January 2025, full month
         (1, 2025, 15, 60000.00, 60851.93),  # January 2025, partial month
         (1, 2025, 2, 60000.00, 8113.59),  # January 2025, 2 days
         (2, 2025, 20, 60000.00, 68965.52),  # February 2025, full month
         (2, 2025, 15, 60000.00, 51724.14),  # February 2025, partial month
-    ]
+    ],
+)
+def test_calculate_salary_net(month, year, days_worked, net_salary, expected_salary):
+    """Test salary calculation for "На руки" mode."""
+    from salary_calculation import calculate_salary
+
+    result = calculate_salary(month, year, days_worked, net_salary, mode="На руки")
+    assert result["before_tax"] == pytest.approx(expected_salary, abs=0.01)
+
+
+@pytest.mark.parametrize(
+    "amount,mode,expected",
+    [
+        (60000.00, "До вычета НДФЛ", {"before_tax": 720000.00, "tax": 93600.00, "after_tax": 626400.00}),
+        (60000.00, "На руки", {"before_tax": 827586.21, "tax": 107586.21, "after_tax": 720000.00}),
+    ],
+)
+def test_calculate_annual_salary(amount, mode, expected):
+    """Test that the annual salary equals twelve fully worked months."""
+    from salary_calculation import calculate_annual_salary
 
-    for month, year, days_worked, net_salary, expected_salary in test_cases_net:
-        result = calculate_salary(month, year, days_worked, net_salary, mode="На руки")
-        assert result["before_tax"] == pytest.approx(
-            expected_salary, abs=0.01
-        ), f"Failed for month {month}, year {year}, days worked {days_worked}, mode=На руки"
+    assert calculate_annual_salary(amount, mode) == pytest.approx(expected, abs=0.01)